@@ -8,8 +8,16 @@ Algorithm based on: https://github.com/cakenggt/Library-Of-Pybel
 """
 from __future__ import annotations
 
+import math
+import os
 import string
-from typing import Tuple
+from functools import lru_cache
+from typing import Tuple, Union
+
+try:
+    import gmpy2  # optional: subquadratic base conversion via GMP
+except ImportError:
+    gmpy2 = None
 
 # Character set: a-z, space, comma, period (29 characters)
 CHARSET = "abcdefghijklmnopqrstuvwxyz ,."
@@ -18,94 +26,210 @@ PAGE_LENGTH = 3200  # 80 chars × 40 lines
 LINES_PER_PAGE = 40
 CHARS_PER_LINE = 80
 
+# Page addresses are memoized only when BABEL_CACHE=1 is set: the cache key is
+# the seed phrase text, so it is not kept in memory by default
+SEARCH_CACHE_SIZE = 128 if os.environ.get('BABEL_CACHE', '').lower() in ('1', 'true', 'yes') else 0
+
+# 29^3200: weight of the library coordinate above the page text
+PAGE_SPACE = CHARSET_LEN ** PAGE_LENGTH
+
 # Base-36 for hex addresses
 BASE36 = string.digits + string.ascii_lowercase
+_BASE36_BYTES = BASE36.encode('ascii').ljust(256)  # digit value -> byte, for translate()
+
+# Digit conversion (base 36 and base 29) splits numbers down to leaves of at
+# most SPLIT_LEAF digits, which are converted one digit at a time
+SPLIT_LEAF = 64
+_BASE36_LEAF_LIMIT = 36 ** SPLIT_LEAF
+
+
+def _split_schedule(base: int, digits: int) -> list:
+    """Balanced divide-and-conquer schedule of (width, base^width) pairs for `digits` digits."""
+    splits = []
+    while digits > SPLIT_LEAF:
+        digits = (digits + 1) // 2
+        splits.append((digits, base ** digits))
+    return splits
+
+
+# Page addresses (coordinate * 29^3200 + text) lie in [PAGE_SPACE, _PAGE_LIMIT),
+# so their base-36 width and split schedule are fixed at import
+_PAGE_LIMIT = PAGE_SPACE * 10 ** 7
+_PAGE_DIGITS = int(math.log(_PAGE_LIMIT, 36)) + 1
+while 36 ** _PAGE_DIGITS <= _PAGE_LIMIT:
+    _PAGE_DIGITS += 1
+_PAGE_SPLITS = _split_schedule(36, _PAGE_DIGITS)
+
+# Same schedule for the 3200-digit base-29 page text
+_TEXT_SPLITS = _split_schedule(CHARSET_LEN, PAGE_LENGTH)
+
+# Byte -> value (0-28) lookup table; anything outside the charset counts as space
+_CHAR_VAL = bytearray([26] * 256)
+for _i, _c in enumerate(CHARSET):
+    _CHAR_VAL[ord(_c)] = _i
+    _CHAR_VAL[ord(_c.upper())] = _i
+del _i, _c
+
+# Value -> byte lookup table, padded to 256 entries for bytes.translate()
+_VAL_CHAR = CHARSET.encode('ascii').ljust(256)
+
+# Byte -> normalized charset byte (lowercase, anything else becomes space)
+_NORMALIZE = _CHAR_VAL.translate(_VAL_CHAR)
+
+# Byte -> base-29 digit ('0'-'9', 'a'-'s') of its charset value, for int(..., 29)
+_CHAR_DIGIT = _CHAR_VAL.translate(BASE36[:CHARSET_LEN].encode('ascii').ljust(256))
+
+# Base-29 digit byte -> charset byte, for text from gmpy2's digits(29)
+_DIGIT_CHAR = bytes.maketrans(BASE36[:CHARSET_LEN].encode('ascii'), CHARSET.encode('ascii'))
 
 
 def _char_to_val(c: str) -> int:
     """Convert character to value (0-28)."""
-    if c.isalpha():
-        return ord(c.lower()) - ord('a')
-    elif c == ' ':
-        return 26
-    elif c == ',':
-        return 27
-    elif c == '.':
-        return 28
-    return 26  # default to space
+    o = ord(c)
+    return _CHAR_VAL[o] if o < 256 else 26  # default to space
 
 
 def _val_to_char(v: int) -> str:
     """Convert value to character."""
-    v = v % CHARSET_LEN
-    if v < 26:
-        return chr(ord('a') + v)
-    elif v == 26:
-        return ' '
-    elif v == 27:
-        return ','
-    else:
-        return '.'
+    return CHARSET[v % CHARSET_LEN]
 
 
-def _to_base36(num: int) -> str:
-    """Convert integer to base-36 string."""
+def _to_base36_small(num: int) -> str:
+    """Convert integer to base-36 string, one digit at a time."""
     if num == 0:
         return '0'
-    result = []
+    # 36 > 2^5, so there are at most bit_length / 5 + 1 digits
+    i = size = num.bit_length() // 5 + 1
+    buf = bytearray(size)
     while num:
-        result.append(BASE36[num % 36])
+        i -= 1
+        buf[i] = num % 36
         num //= 36
-    return ''.join(reversed(result))
+    return buf[i:].translate(_BASE36_BYTES).decode('ascii')
 
 
-def _from_base36(s: str) -> int:
-    """Convert base-36 string to integer."""
-    return int(s.lower(), 36)
+def _fill_digits(num: int, buf: bytearray, end: int, base: int, splits: list, level: int = 0) -> None:
+    """Write num's digit values into buf, ending just before `end`, via a split schedule."""
+    if level == len(splits):
+        while num:
+            end -= 1
+            buf[end] = num % base
+            num //= base
+        return
+    w, power = splits[level]
+    hi, lo = divmod(num, power)
+    _fill_digits(lo, buf, end, base, splits, level + 1)
+    _fill_digits(hi, buf, end - w, base, splits, level + 1)
 
 
-def _normalize_text(text: str) -> str:
-    """Normalize text: lowercase, valid chars only, pad to 3200."""
-    result = []
-    for c in text.lower():
-        if c in CHARSET:
-            result.append(c)
-        else:
-            result.append(' ')
+def _parse_digits(digits: Union[str, bytes], base: int, splits: list, level: int = 0) -> int:
+    """
+    Parse digit characters via a split schedule (the inverse of _fill_digits).
+
+    int() only ever sees leaves of at most SPLIT_LEAF digits, which keeps it
+    clear of CPython's int_max_str_digits limit (640 at minimum).
+    """
+    if level == len(splits):
+        return int(digits, base)
+    w, power = splits[level]
+    return (_parse_digits(digits[:-w], base, splits, level + 1) * power +
+            _parse_digits(digits[-w:], base, splits, level + 1))
 
-    text = ''.join(result).rstrip()
 
-    # Pad to PAGE_LENGTH
-    if len(text) < PAGE_LENGTH:
-        text = text.ljust(PAGE_LENGTH)
+def _to_base36(num: int) -> str:
+    """
+    Convert integer to base-36 string.
+
+    Large numbers are split by a balanced schedule (precomputed for page
+    addresses) so the digit-at-a-time loop only runs on small leaves.
+    Uses GMP when gmpy2 is installed.
+    """
+    if gmpy2 is not None:
+        return gmpy2.mpz(num).digits(36)
+    if num < _BASE36_LEAF_LIMIT:
+        return _to_base36_small(num)
+    if PAGE_SPACE <= num < _PAGE_LIMIT:
+        digits, splits = _PAGE_DIGITS, _PAGE_SPLITS
     else:
-        text = text[:PAGE_LENGTH]
+        digits = num.bit_length() // 5 + 1  # 36 > 2^5
+        splits = _split_schedule(36, digits)
+    buf = bytearray(digits)
+    _fill_digits(num, buf, digits, 36, splits)
+    return buf.translate(_BASE36_BYTES).decode('ascii').lstrip('0')
+
+
+def _from_base36(s: str) -> int:
+    """Convert base-36 string to integer."""
+    if gmpy2 is not None:
+        return int(gmpy2.mpz(s.lower(), 36))
+    return _parse_digits(s.lower(), 36, _split_schedule(36, len(s)))
 
-    return text
 
+def _normalize_text(text: str) -> bytes:
+    """Normalize text: lowercase, valid chars only, pad to 3200 (as ASCII bytes)."""
+    data = text.lower().encode('ascii', 'replace').translate(_NORMALIZE)
+    return data[:PAGE_LENGTH].ljust(PAGE_LENGTH)
 
-def _text_to_number(text: str) -> int:
-    """Convert text to base-29 number."""
-    text = _normalize_text(text)
-    result = 0
-    for i, c in enumerate(reversed(text)):
-        result += _char_to_val(c) * (CHARSET_LEN ** i)
-    return result
+
+def _page_to_number(data: bytes) -> int:
+    """
+    Convert normalized page bytes to base-29 number.
+
+    The bytes are translated to base-29 digits and parsed by GMP when gmpy2
+    is installed, else by int() on the leaves of the _TEXT_SPLITS schedule.
+    """
+    digits = data.translate(_CHAR_DIGIT)
+    if gmpy2 is not None:
+        return int(gmpy2.mpz(digits, 29))
+    return _parse_digits(digits, CHARSET_LEN, _TEXT_SPLITS)
 
 
 def _number_to_text(num: int) -> str:
-    """Convert base-29 number to text."""
-    chars = []
-    for _ in range(PAGE_LENGTH):
-        chars.append(_val_to_char(num % CHARSET_LEN))
-        num //= CHARSET_LEN
-    return ''.join(reversed(chars))
+    """
+    Convert base-29 number to text (the low PAGE_LENGTH digits).
+
+    Uses GMP when gmpy2 is installed, else the _TEXT_SPLITS schedule, so the
+    per-digit loop only runs on small leaves.
+    """
+    num %= PAGE_SPACE
+    if gmpy2 is not None:
+        digits = gmpy2.mpz(num).digits(CHARSET_LEN).rjust(PAGE_LENGTH, '0')
+        return digits.encode('ascii').translate(_DIGIT_CHAR).decode('ascii')
+    vals = bytearray(PAGE_LENGTH)
+    _fill_digits(num, vals, PAGE_LENGTH, CHARSET_LEN, _TEXT_SPLITS)
+    return vals.translate(_VAL_CHAR).decode('ascii')
 
 
 def _make_coordinate(wall: int, shelf: int, volume: int, page: int) -> int:
     """Create library coordinate from location."""
     # Format: PPPVVSW (page 3 digits, volume 2 digits, shelf 1 digit, wall 1 digit)
-    return int(f"{page:03d}{volume:02d}{shelf}{wall}")
+    return page * 10000 + volume * 100 + shelf * 10 + wall
+
+
+@lru_cache(maxsize=SEARCH_CACHE_SIZE)
+def _address(data: bytes, coord: int) -> int:
+    """
+    Combine normalized page bytes with a library coordinate (memoized if BABEL_CACHE).
+
+    Every search entry point goes through here with the same key shape, so
+    repeated lookups of one text hit the cache however they were called.
+    """
+    # Combine: coordinate * 29^3200 + text_number
+    return coord * PAGE_SPACE + _page_to_number(data)
+
+
+def search_text_raw(text: str, wall: int = 1, shelf: int = 1, volume: int = 1, page: int = 1) -> Tuple[int, int, int, int, int]:
+    """
+    Find Library of Babel coordinates for text, keeping the address as an int.
+
+    Skips the base-36 conversion; use it when the hex name is not displayed.
+
+    Returns: (address, wall, shelf, volume, page)
+    """
+    coord = _make_coordinate(wall, shelf, volume, page)
+    combined = _address(_normalize_text(text), coord)
+
+    return combined, wall, shelf, volume, page
 
 
 def search_text_local(text: str, wall: int = 1, shelf: int = 1, volume: int = 1, page: int = 1) -> Tuple[str, int, int, int, int]:
@@ -114,27 +238,25 @@ def search_text_local(text: str, wall: int = 1, shelf: int = 1, volume: int = 1,
 
     Returns: (hex_name, wall, shelf, volume, page)
     """
-    coord = _make_coordinate(wall, shelf, volume, page)
-    text_num = _text_to_number(text)
-
-    # Combine: coordinate * 29^3200 + text_number
-    combined = coord * (CHARSET_LEN ** PAGE_LENGTH) + text_num
+    combined, wall, shelf, volume, page = search_text_raw(text, wall, shelf, volume, page)
     hex_name = _to_base36(combined)
 
     return hex_name, wall, shelf, volume, page
 
 
-def get_page_content(hex_name: str, wall: int, shelf: int, volume: int, page: int) -> str:
+def get_page_content(hex_name: Union[str, int], wall: int, shelf: int, volume: int, page: int) -> str:
     """
     Get the text content of a Library of Babel page (LOCAL - no internet).
 
+    hex_name may also be the int address returned by search_text_raw.
+
     Returns the 3200-character page content.
     """
     coord = _make_coordinate(wall, shelf, volume, page)
-    combined = _from_base36(hex_name)
+    combined = hex_name if isinstance(hex_name, int) else _from_base36(hex_name)
 
     # Extract text number
-    text_num = combined - coord * (CHARSET_LEN ** PAGE_LENGTH)
+    text_num = combined - coord * PAGE_SPACE
 
     return _number_to_text(text_num)
 
@@ -147,8 +269,10 @@ def format_page(content: str) -> str:
     return '\n'.join(lines[:LINES_PER_PAGE])
 
 
-def coordinates_to_url(hex_name: str, wall: int, shelf: int, volume: int, page: int) -> str:
-    """Generate a Library of Babel URL from coordinates."""
+def coordinates_to_url(hex_name: Union[str, int], wall: int, shelf: int, volume: int, page: int) -> str:
+    """Generate a Library of Babel URL from coordinates (hex name or int address)."""
+    if isinstance(hex_name, int):
+        hex_name = _to_base36(hex_name)
     return f"https://libraryofbabel.info/book.cgi?{hex_name}-w{wall}-s{shelf}-v{volume:02d}:{page}"
 
 
@@ -12,6 +12,9 @@ from .converter import (
     story_to_page, seed_to_page, get_babel_location
 )
 
+# Formatting characters stripped from babel strings before decoding
+_STRIP_TABLE = str.maketrans('', '', '- .\t\n')
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -125,7 +128,7 @@ Examples:
                     print(url)
             else:
                 # Syllable mode - remove formatting
-                clean_babel = args.input.replace('-', '').replace(' ', '').replace('.', '').lower()
+                clean_babel = args.input.translate(_STRIP_TABLE).lower()
                 if args.seed:
                     seed = babel_to_seed(clean_babel)
                     print(seed)
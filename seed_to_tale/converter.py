@@ -7,11 +7,21 @@ Flow:
 """
 from __future__ import annotations
 
+import re
+from typing import List, Optional
+
 from .bip39 import mnemonic_to_entropy, entropy_to_mnemonic
 from .syllables import bytes_to_syllables, syllables_to_bytes, bytes_to_syllable_list
-from .babel_lib import search_text, coordinates_to_url, get_page_content, format_page
+from .babel_lib import search_text, search_text_raw, coordinates_to_url, get_page_content, format_page
 from .story import entropy_to_story, story_to_entropy
 
+# Splits a babel string into the default 4-character chunks
+_CHUNK_RE = re.compile(r'.{1,4}', re.DOTALL)
+
+# Seeds per worker task in seed_to_url_many; also the per-worker batch
+# size below which the process pool is not worth starting
+_POOL_CHUNK = 16
+
 
 def seed_to_babel(mnemonic: str) -> str:
     """
@@ -56,6 +66,28 @@ def seed_to_url(mnemonic: str) -> str:
     return coordinates_to_url(hex_name, wall, shelf, volume, page)
 
 
+def seed_to_url_many(mnemonics: List[str], max_workers: Optional[int] = None) -> List[str]:
+    """
+    Convert many seed phrases to their Library of Babel URLs, in order.
+
+    Runs serially in this process by default. Passing max_workers > 1 opts
+    in to a process pool of at most max_workers processes, with at least 16
+    seeds per worker, so it may use fewer workers than requested. Batches
+    of fewer than 32 seeds always run serially, because process startup and
+    pickling outweigh the ~1 ms per seed. On spawn-start platforms (macOS,
+    Windows) the opt-in requires the caller's script to use an
+    `if __name__ == "__main__":` guard.
+    """
+    workers = min(max_workers or 1, len(mnemonics) // _POOL_CHUNK)
+    if workers < 2:
+        return [seed_to_url(m) for m in mnemonics]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(seed_to_url, mnemonics, chunksize=_POOL_CHUNK))
+
+
 def seed_to_story(mnemonic: str) -> str:
     """
     Convert a seed phrase to a memorable story (4 vivid sentences).
@@ -88,8 +120,8 @@ def story_to_page(story: str) -> str:
     Returns the formatted 3200-character page showing the seed phrase.
     """
     seed_phrase = story_to_seed(story)
-    hex_name, wall, shelf, volume, page = search_text(seed_phrase)
-    content = get_page_content(hex_name, wall, shelf, volume, page)
+    address, wall, shelf, volume, page = search_text_raw(seed_phrase)
+    content = get_page_content(address, wall, shelf, volume, page)
     return format_page(content)
 
 
@@ -97,8 +129,8 @@ def seed_to_page(mnemonic: str) -> str:
     """
     Convert a seed phrase to its Library of Babel page content (OFFLINE).
     """
-    hex_name, wall, shelf, volume, page = search_text(mnemonic)
-    content = get_page_content(hex_name, wall, shelf, volume, page)
+    address, wall, shelf, volume, page = search_text_raw(mnemonic)
+    content = get_page_content(address, wall, shelf, volume, page)
     return format_page(content)
 
 
@@ -127,6 +159,8 @@ def format_babel_string(babel: str, chunk_size: int = 4) -> str:
 
     Breaks into chunks: "aztulinerblinken" -> "aztu-line-rbli-nken"
     """
+    if chunk_size == 4:
+        return '-'.join(_CHUNK_RE.findall(babel))
     chunks = [babel[i:i + chunk_size] for i in range(0, len(babel), chunk_size)]
     return '-'.join(chunks)
 